@@ -0,0 +1 @@
+"""movAI: movie details and streaming availability lookup."""
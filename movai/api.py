@@ -0,0 +1,367 @@
+"""
+movAI API layer
+Fetches movie details from OMDB and streaming availability from Streaming Availability API (RapidAPI),
+and parses the responses for the Streamlit UI in movie_lookup.py.
+"""
+
+import base64
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from itertools import islice
+from pathlib import Path
+from types import MappingProxyType
+
+import diskcache
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
+# API keys loaded from .streamlit/secrets.toml (local) or Streamlit Cloud secrets
+OMDB_API_KEY = st.secrets.get("OMDB_API_KEY", "")
+RAPIDAPI_KEY = st.secrets.get("RAPIDAPI_KEY", "")
+
+OMDB_URL = "https://www.omdbapi.com/"
+STREAMING_BASE_URL = "https://streaming-availability.p.rapidapi.com/shows/"
+STREAMING_HEADERS = {
+    "X-RapidAPI-Key": RAPIDAPI_KEY,
+    "X-RapidAPI-Host": "streaming-availability.p.rapidapi.com",
+}
+
+FETCH_WORKERS = 8
+PREFETCH_WORKERS = 2
+
+# Posters are optional decoration on the detail view, so they get a short deadline and no retries.
+POSTER_TIMEOUT = 3
+
+# Cache lifetimes in seconds: movie metadata is stable, streaming windows change.
+SEARCH_TTL = 3600
+MOVIE_TTL = 604800
+STREAMING_TTL = 21600
+
+# Second cache tier below st.cache_data; survives process restarts.
+DISK_CACHE_DIR = Path(__file__).parent.parent / ".omdb_cache"
+
+
+@st.cache_resource
+def get_session():
+    """Shared HTTP session so repeat lookups reuse keep-alive connections."""
+    session = requests.Session()
+    # Retry connection errors and 5xx with backoff; 4xx (bad key, not found) fail fast.
+    retries = Retry(
+        total=2,
+        backoff_factor=0.25,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    # Size host pools above the worker count so concurrent fetches reuse sockets instead of discarding them.
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=FETCH_WORKERS * 2, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": "movAI/1.0"})
+    return session
+
+
+@st.cache_resource
+def get_poster_session():
+    """HTTP session for poster downloads; fails fast instead of retrying."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=FETCH_WORKERS, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": "movAI/1.0"})
+    return session
+
+
+@st.cache_resource
+def get_disk_cache():
+    """Persistent on-disk cache shared by every session in the process."""
+    return diskcache.Cache(DISK_CACHE_DIR, size_limit=200_000_000)
+
+
+def clear_caches():
+    """Drop both the in-memory and on-disk lookup caches."""
+    st.cache_data.clear()
+    _fetch_streaming.clear()
+    get_disk_cache().clear()
+
+
+def _get_json(url, **kwargs):
+    """GET a URL on the shared session and decode the JSON body."""
+    resp = get_session().get(url, timeout=10, **kwargs)
+    resp.raise_for_status()
+    return _loads(resp.content)
+
+
+@st.cache_data(ttl=SEARCH_TTL, show_spinner=False)
+def fetch_search_results(query):
+    """Search OMDB for multiple matching titles."""
+    data = _get_json(OMDB_URL, params={"s": query, "apikey": OMDB_API_KEY, "type": "movie"})
+    if data.get("Response") == "False":
+        return []
+    return data.get("Search", [])
+
+
+@st.cache_data(ttl=MOVIE_TTL, show_spinner=False)
+def fetch_movie_by_id(imdb_id):
+    """Fetch full movie details by IMDB ID."""
+    disk = get_disk_cache()
+    key = ("omdb", imdb_id)
+    data = disk.get(key)
+    if data is not None:
+        return data
+    data = _get_json(OMDB_URL, params={"i": imdb_id, "apikey": OMDB_API_KEY, "plot": "short"})
+    if data.get("Response") != "False":
+        disk.set(key, data, expire=MOVIE_TTL)
+    return data
+
+
+# Held with cache_resource: every session shares one payload instead of paying
+# st.cache_data's unpickle-a-copy on every hit, so it is handed out read-only.
+@st.cache_resource(ttl=STREAMING_TTL, show_spinner=False)
+def _fetch_streaming(imdb_id):
+    """Fetch raw streaming availability; transient errors propagate so they are never cached."""
+    disk = get_disk_cache()
+    key = ("streaming", imdb_id)
+    data = disk.get(key)
+    if data is not None:
+        return MappingProxyType(data)
+    try:
+        data = _get_json(f"{STREAMING_BASE_URL}{imdb_id}", headers=STREAMING_HEADERS, params={"country": "us"})
+    except requests.HTTPError as e:
+        # A 404 means the title is not in RapidAPI's catalog: a stable answer, cached as no availability.
+        if e.response is None or e.response.status_code != 404:
+            raise
+        data = {}
+    disk.set(key, data, expire=STREAMING_TTL)
+    return MappingProxyType(data)
+
+
+def fetch_streaming(imdb_id):
+    """Fetch streaming availability using IMDB ID.
+
+    The payload is a read-only view shared by every session; nested values must not be mutated.
+    """
+    if not RAPIDAPI_KEY:
+        return None
+    try:
+        return _fetch_streaming(imdb_id)
+    except Exception:
+        return None
+
+
+@st.cache_data(ttl=MOVIE_TTL, max_entries=128, show_spinner=False)
+def poster_src(url):
+    """Return a poster as an inline data: URI, falling back to the remote URL.
+
+    The fallback is cached too, so an unreachable poster host costs one bounded attempt per title.
+    """
+    try:
+        resp = get_poster_session().get(url, timeout=POSTER_TIMEOUT)
+        resp.raise_for_status()
+    except requests.RequestException:
+        return url
+    content_type = resp.headers.get("Content-Type", "image/jpeg")
+    return f"data:{content_type};base64,{base64.b64encode(resp.content).decode('ascii')}"
+
+
+@st.cache_resource
+def get_executor():
+    """Shared worker pool for overlapping blocking API calls across reruns."""
+    return ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="movai-fetch")
+
+
+@st.cache_resource
+def get_prefetch_executor():
+    """Separate small pool for speculative prefetches so interactive fetches never queue behind them."""
+    return ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="movai-prefetch")
+
+
+def fetch_details(imdb_id):
+    """Fetch OMDB details, poster src ("" if none) and streaming availability concurrently."""
+    pool = get_executor()
+    omdb_future = pool.submit(fetch_movie_by_id, imdb_id)
+    streaming_future = pool.submit(fetch_streaming, imdb_id)
+    omdb = omdb_future.result()
+    poster = omdb.get("Poster", "")
+    if not poster or poster == "N/A":
+        return omdb, "", streaming_future.result()
+    poster_future = pool.submit(poster_src, poster)
+    streaming = streaming_future.result()
+    # Never hold the card for the poster past its own timeout; a late download
+    # still finishes in the background and is inlined on the next view.
+    try:
+        poster = poster_future.result(timeout=POSTER_TIMEOUT)
+    except FutureTimeoutError:
+        pass
+    return omdb, poster, streaming
+
+
+def _unique_ids(imdb_ids):
+    """Drop empty IDs and duplicates, keeping first-seen order."""
+    return list(dict.fromkeys(i for i in imdb_ids if i))
+
+
+def prefetch_streaming(imdb_ids):
+    """Warm the streaming cache in the background; a later fetch joins any in-flight request."""
+    if not RAPIDAPI_KEY:
+        return
+    pool = get_prefetch_executor()
+    for imdb_id in _unique_ids(imdb_ids):
+        pool.submit(fetch_streaming, imdb_id)
+
+
+def fetch_streaming_bulk(imdb_ids):
+    """Fetch streaming availability for several IMDB IDs concurrently, keyed by ID.
+
+    Values are the shared read-only payloads from fetch_streaming and must not be mutated.
+    """
+    ids = _unique_ids(imdb_ids)
+    return dict(zip(ids, get_executor().map(fetch_streaming, ids)))
+
+
+_ORDINAL_SUFFIXES = ("th", "st", "nd", "rd", "th", "th", "th", "th", "th", "th")
+# Full suffix for every day of the month, indexed by day (index 0 unused).
+_DAY_SUFFIX = ("",) + tuple(
+    "th" if 11 <= day <= 13 else _ORDINAL_SUFFIXES[day % 10] for day in range(1, 32)
+)
+_MONTHS = (
+    "", "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+
+def _format_date(ts):
+    """Format a Unix timestamp as 'February 3rd, 2026'."""
+    tm = time.gmtime(ts)
+    return f"{_MONTHS[tm.tm_mon]} {tm.tm_mday}{_DAY_SUFFIX[tm.tm_mday]}, {tm.tm_year}"
+
+
+_TYPE_PRIORITY = {
+    "subscription": 0, "free": 1, "ads": 2,
+    "rent": 3, "buy": 4, "addon": 5,
+}
+_LABEL_MAP = {
+    "subscription": "Subscription",
+    "free": "Free",
+    "ads": "Free with Ads",
+    "rent": "Rent",
+    "buy": "Buy",
+    "addon": "Add-on",
+}
+
+
+class _Offer:
+    """Best offer seen so far for one platform, updated in place."""
+
+    __slots__ = ("prio", "price", "price_fmt", "mtype", "date")
+
+    def __init__(self, prio, price, price_fmt, mtype, date):
+        self.set(prio, price, price_fmt, mtype, date)
+
+    def set(self, prio, price, price_fmt, mtype, date):
+        self.prio = prio
+        self.price = price
+        self.price_fmt = price_fmt
+        self.mtype = mtype
+        self.date = date
+
+
+def parse_streaming(data):
+    """Parse Streaming Availability API response into structured list."""
+    if not data:
+        return []
+
+    try:
+        options = data["streamingOptions"]["us"]
+    except (KeyError, TypeError):
+        return []
+    if not options:
+        return []
+
+    best = {}
+    best_get = best.get
+    now_ts = time.time()
+    prio_of = _TYPE_PRIORITY.get
+
+    for opt in options:
+        mtype = opt.get("type")
+        if not mtype:
+            continue
+        try:
+            platform = opt["service"]["name"]
+        except (KeyError, TypeError):
+            platform = "Unknown"
+
+        # An option ranked below the platform's current best can never replace it,
+        # so skip its price and date parsing.
+        prio = prio_of(mtype, 99)
+        current = best_get(platform)
+        if current is not None and prio > current.prio:
+            continue
+
+        price_obj = opt.get("price")
+        try:
+            price_amount = float(price_obj["amount"])
+        except (KeyError, TypeError):
+            price_amount = None
+        if price_amount is not None:
+            currency = price_obj.get("currency", "USD")
+            price_formatted = f"${price_amount:.2f}" if currency == "USD" else f"{price_amount:.2f} {currency}"
+        else:
+            price_formatted = ""
+
+        date_str = ""
+        available_ts = opt.get("availableSince")
+        expires_ts = opt.get("expiresOn")
+        if available_ts and available_ts > now_ts:
+            date_str = _format_date(available_ts)
+        elif expires_ts and expires_ts > now_ts:
+            date_str = "until " + _format_date(expires_ts)
+
+        if current is None:
+            best[platform] = _Offer(prio, price_amount, price_formatted, mtype, date_str)
+        elif prio < current.prio:
+            current.set(prio, price_amount, price_formatted, mtype, date_str)
+        elif prio == current.prio and price_amount is not None:
+            if current.price is None or price_amount < current.price:
+                current.set(prio, price_amount, price_formatted, mtype, date_str)
+
+    # Priorities are a handful of small ints, so bucket instead of sorting;
+    # unknown types (priority 99) land in the last bucket.
+    last = len(_TYPE_PRIORITY)
+    buckets = [[] for _ in range(last + 1)]
+    for platform, offer in best.items():
+        mtype = offer.mtype
+        buckets[min(offer.prio, last)].append({
+            "platform": platform,
+            "type": mtype,
+            "label": _LABEL_MAP.get(mtype, mtype.capitalize()),
+            "price": offer.price_fmt,
+            "date": offer.date,
+        })
+    return [opt for bucket in buckets for opt in bucket]
+
+
+# Whitespace after ., ! or ? ends a sentence; an ellipsis does not.
+_SENT_SPLIT = re.compile(r"(?<=[.!?])(?<!\.\.\.)\s+")
+
+
+def truncate_plot(plot, max_sentences=3):
+    """Limit plot to a few sentences."""
+    if not plot or plot == "N/A":
+        return plot
+    cuts = [m.end() for m in islice(_SENT_SPLIT.finditer(plot), max_sentences)]
+    if len(cuts) < max_sentences:
+        return plot
+    return plot[:cuts[-1]].rstrip()